@@ -1,21 +1,33 @@
 """Core source code file of TurtLSystems Python package (https://pypi.org/project/TurtLSystems)."""
+import math
 import os
 import subprocess
 import tkinter
 import turtle
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import ExitStack
+from functools import lru_cache, partial
+from itertools import chain, islice, repeat
 from pathlib import Path
-from shutil import copyfile
-from string import digits
+from shutil import copyfile, which
+from string import ascii_letters, ascii_lowercase, ascii_uppercase, digits
 from tempfile import TemporaryDirectory
-from typing import Any, Callable, cast, Collection, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from typing import Any, Callable, cast, Collection, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 from packaging import version
-from PIL import Image
+from PIL import Image, ImageChops, ImageDraw
 
 # Types:
 Color = Tuple[int, int, int]
 OpColor = Optional[Color]
+CanvasItem = Tuple[str, Tuple[float, ...], OpColor, OpColor, float]  # Kind, coords, fill, outline, and width.
+Snapshot = Tuple[Tuple[int, int], List[CanvasItem]]
+ItemRecords = Dict[int, Optional[CanvasItem]]  # Canvas item ids to what snapshots draw of them, None for nothing.
+# L-system state pushed by [ and popped by ]. A plain tuple since one is made for every [ and tuples are much cheaper
+# to create than class instances. Fields are position, heading, angle, length, thickness, pen_color, fill_color,
+# swap_signs, swap_cases, and modify_fill.
+State = Tuple[Tuple[float, float], float, float, float, float,
+              Optional[Tuple[float, float, float]], Optional[Tuple[float, float, float]], bool, bool, bool]
 
 # Globals:
 DEFAULT_COLORS = (
@@ -33,6 +45,7 @@ DEFAULT_COLORS = (
 PNG_EXT, GIF_EXT, EPS_EXT = '.png', '.gif', '.eps'
 FINAL_NAME, FRAME_NAME, LEVEL_NAME, DRAW_DIR_NAME = 'final', 'frame', 'level', 'draw'
 DPI = 96
+SWAPPED_CASES = dict(zip(ascii_letters, ascii_letters.swapcase()))
 
 # Mutating globals:
 _DRAW_NUMBER = 0
@@ -42,36 +55,6 @@ _GHOSTSCRIPT = ''
 # Exit exception:
 Exit = turtle.Terminator, tkinter.TclError
 
-# Dataclasses are not in 3.6 and SimpleNamespace is not typed properly so decided to use a plain class for State.
-
-
-class State:  # pylint: disable=too-many-instance-attributes,too-few-public-methods
-    """L-system state."""
-
-    def __init__(
-        self,
-        position: Tuple[float, float],
-        heading: float, angle: float,
-        length: float,
-        thickness: float,
-        pen_color: Optional[Tuple[float, float, float]],
-        fill_color: Optional[Tuple[float, float, float]],
-        swap_signs: bool,
-        swap_cases: bool,
-        modify_fill: bool
-    ) -> None:
-        self.position = position
-        self.heading = heading
-        self.angle = angle
-        self.length = length
-        self.thickness = thickness
-        self.pen_color = pen_color
-        self.fill_color = fill_color
-        self.swap_signs = swap_signs
-        self.swap_cases = swap_cases
-        self.modify_fill = modify_fill
-
-
 #####################
 # Package Functions #
 #####################
@@ -111,6 +94,7 @@ def init(
             When None, an educated guess of the path is made on Windows and 'gs' is used on Mac/Linux.
             Ghostscript is the image conversion tool required for png and gif output:
             https://ghostscript.com/releases/gsdnld.html
+            When it's not found Pillow draws png and gif output instead, without text.
         - `logo_mode=False` (bool):
             Whether the turtle graphics coordinates mode is 'standard' or 'logo'. Defaults to standard.
             In standard mode an angle of 0 points rightward and positive angles go counterclockwise.
@@ -347,7 +331,6 @@ def draw(
         - `padding=10` (int | None):
             The amount of padding in pixels to frame the drawing with on all sides in png and gif output.
             Negative values are valid. When None, no padding happens and the entire canvas area is saved.
-            Note that padding very large blank areas can be slow.
         - `transparent=False` (bool):
             When True, the background of png and gif output is transparent rather that the window background color.
         - `antialiasing=4` (int):
@@ -412,14 +395,19 @@ def draw(
         init()
 
     turtle.colormode(255)
-    if background_color:
+    # Setting the background redraws the window so skip it when unchanged. Compared as is since it may be named.
+    if background_color and turtle.bgcolor() != tuple(background_color):
         turtle.bgcolor(background_color)
     true_background_color = cast(Color, conform_color(turtle.bgcolor()))
 
+    rasterize = False
     if png or gif:
         if not _GHOSTSCRIPT:
             _GHOSTSCRIPT = guess_ghostscript()
             message(f'Guessed ghostscript to be "{_GHOSTSCRIPT}".')
+        if not which(_GHOSTSCRIPT):
+            rasterize = True
+            message(f'Ghostscript "{_GHOSTSCRIPT}" not found so png and gif output will be drawn without text.')
 
     if gif and growth:  # Do growth animation of all levels of the L-system with recursive draw png calls.
         # Didn't put this in own function since it would need every single little arg. Cumbersome either way.
@@ -501,6 +489,7 @@ def draw(
     orient(t, position, heading)
 
     string = prefix + lsystem(start, rules, level) + suffix
+    records: ItemRecords = {}  # Canvas items shared by all the snapshots of this draw, when rasterizing.
     with ExitStack() as exit_stack:
         if png or gif:
             if not tmpdir:
@@ -527,14 +516,17 @@ def draw(
                               frame_every=frame_every,
                               max_frames=max_frames,
                               drawdir=drawdir if gif else None,
+                              save_canvas=partial(save_raster, output_scale=output_scale, antialiasing=antialiasing,
+                                                  records=records) if rasterize else save_eps,
                               callback=callback
                               )
 
         if png:
             eps = str((drawdir / FINAL_NAME).with_suffix(EPS_EXT))
             try:
-                png, _ = save_png(png, eps, save_eps(eps), output_scale, antialiasing,
-                                  true_background_color, transparent, padding)
+                size = save_raster(eps, output_scale, antialiasing, records) if rasterize else save_eps(eps)
+                png, _ = save_png(png, eps, size, output_scale, antialiasing,
+                                  true_background_color, transparent, padding, rasterized=rasterize)
                 message(f'Saved png "{png}".')
             except Exception as e:  # pylint: disable=broad-except
                 message('Unable to save png:', e)
@@ -542,7 +534,7 @@ def draw(
         if gif:
             try:
                 pngs = prep_gif(eps_paths, size, true_background_color,
-                                output_scale, antialiasing, padding, transparent)
+                                output_scale, antialiasing, padding, transparent, rasterized=rasterize)
                 save_gif(gif, pngs, transparent, duration, pause, defer, loops, reverse, alternate)
                 message(f'Saved gif "{gif}".')
             except Exception as e:  # pylint: disable=broad-except
@@ -627,11 +619,17 @@ def lsystem(start: str, rules: Union[Dict[str, str], str], level: int) -> str:
     ---
     Documentation available on a single page at https://github.com/discretegames/TurtLSystems#lsystem
     """
-    if isinstance(rules, str):
-        rules = make_rules(rules)
+    rules = make_rules(rules)
+    # Rather than passing over every character of the string on each level, expand each symbol once per level from a
+    # few joins of the level below. Only the current level is kept, so nothing outlives the call.
+    # Going down from `start` first finds the symbols each level needs, so unreachable rules are never expanded.
+    needed = [set(start)]
     for _ in range(level):
-        start = ''.join(rules.get(c, c) for c in start)
-    return start
+        needed.append(set(''.join([rules.get(symbol, symbol) for symbol in needed[-1]])))
+    expansions = {symbol: symbol for symbol in needed.pop()}
+    while needed:
+        expansions = {symbol: ''.join([expansions[c] for c in rules.get(symbol, symbol)]) for symbol in needed.pop()}
+    return ''.join([expansions[symbol] for symbol in start])
 
 
 ####################
@@ -653,10 +651,22 @@ def clamp(value: float, minimum: int = 0, maximum: int = 255) -> float:
 def conform_color(color: Optional[Sequence[float]]) -> OpColor:
     """Ensures `color` is a tuple with 0-255 clamped rgb."""
     if color:
-        return round(clamp(color[0])), round(clamp(color[1])), round(clamp(color[2]))
+        return conform_rgb(color[0], color[1], color[2])
     return None
 
 
+@lru_cache(maxsize=256)
+def conform_rgb(red: float, green: float, blue: float) -> Color:
+    """Clamps and rounds rgb channels. Cached since a draw keeps revisiting the same few colors."""
+    return round(clamp(red)), round(clamp(green)), round(clamp(blue))
+
+
+@lru_cache(maxsize=256)
+def rgb_to_hex(color: Color) -> str:
+    """Formats a 0-255 rgb tuple as a Tk color string, the way turtle does. Cached since palettes are small."""
+    return f'#{color[0]:02x}{color[1]:02x}{color[2]:02x}'
+
+
 def make_rules(rules: Union[Dict[str, str], str]) -> Dict[str, str]:
     """Creates rules dict."""
     if isinstance(rules, str):
@@ -688,20 +698,18 @@ def make_drawdir(tmpdir: str) -> Path:
 
 def orient(t: turtle.Turtle, position: Optional[Tuple[float, float]], heading: Optional[float] = None) -> None:
     """Silently orients turtle `t` to given `position` and `heading`."""
-    speed = t.speed()
-    down, visible = t.isdown(), t.isvisible()
+    screen = t.getscreen()
+    tracer, delay = screen.tracer(), screen.delay()
+    screen.tracer(0, 0)  # Batch the steps below into one screen update rather than animating and refreshing each.
+    down = t.isdown()
     t.penup()
-    t.hideturtle()
-    t.speed(0)
     if position:
         t.setposition(position)
     if heading is not None:
         t.setheading(heading)
-    t.speed(speed)
     if down:
         t.pendown()
-    if visible:
-        t.showturtle()
+    screen.tracer(tracer, delay)
 
 
 def guess_ghostscript() -> str:
@@ -730,6 +738,18 @@ def guess_ghostscript() -> str:
 
 def eps_to_png(eps: str, png: str, size: Tuple[int, int], output_scale: float, antialiasing: int) -> None:
     """Uses ghostscript to convert eps file to png with transparent background."""
+    eps_to_pngs([eps], [png], size, output_scale, antialiasing)
+
+
+def eps_to_pngs(
+        eps_paths: List[str], pngs: List[str], size: Tuple[int, int], output_scale: float, antialiasing: int) -> None:
+    """Uses one ghostscript process to convert eps files to pngs with transparent backgrounds.
+    Ghostscript's startup costs more than converting a small eps so this is much faster than many eps_to_png calls.
+    """
+    if not eps_paths:
+        return
+    # Each eps is one page and ghostscript numbers pages from 1 across all its input files.
+    output = pngs[0] if len(pngs) == 1 else str(Path(pngs[0]).with_name(f'{Path(pngs[0]).stem}_page%d{PNG_EXT}'))
     result = subprocess.run([_GHOSTSCRIPT,
                              '-q',
                             '-dSAFER',
@@ -741,31 +761,31 @@ def eps_to_png(eps: str, png: str, size: Tuple[int, int], output_scale: float, a
                              f'-g{round(output_scale * size[0])}x{round(output_scale * size[1])}',
                              f'-dGraphicsAlphaBits={antialiasing}',
                              f'-dTextAlphaBits={antialiasing}',
-                             f'-sOutputFile={png}',
-                             eps],
+                             f'-sOutputFile={output}',
+                             *eps_paths],
                             check=False, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, encoding='utf-8')
     if result.returncode:
         message(f'Ghostscript ({_GHOSTSCRIPT}) exit code {result.returncode}:')
         message(result.stdout)
+    if len(pngs) > 1:
+        for page, png in enumerate(pngs, 1):
+            page_png = Path(output.replace('%d', str(page)))
+            if page_png.exists():
+                page_png.replace(png)
 
 
 def get_padding_rect(
         image: Image.Image, padding: int, background_color: Color) -> Tuple[int, int, int, int]:
     """Returns rectangle around content pixels in `image` padded by `padding` on all sides."""
     message(f'Calculating padding for {image.width}x{image.height} pixel image...')
-    x_min, y_min, x_max, y_max = image.width - 1, image.height - 1, 0, 0
-    data = image.load()
-    empty = True
-    for y in range(image.height):
-        for x in range(image.width):
-            if data[x, y][3] == 0 or background_color == data[x, y][:3]:
-                continue
-            empty = False
-            x_min = min(x_min, x)
-            y_min = min(y_min, y)
-            x_max = max(x_max, x)
-            y_max = max(y_max, y)
-    if empty:
+    # Content pixels are visible and differ from the background color in some channel. Pillow finds them in C.
+    difference = ImageChops.difference(image.convert('RGB'), Image.new('RGB', image.size, background_color))
+    red, green, blue = difference.split()
+    content = ImageChops.darker(ImageChops.lighter(ImageChops.lighter(red, green), blue), image.getchannel('A'))
+    bbox = content.getbbox()
+    if bbox:
+        x_min, y_min, x_max, y_max = bbox[0], bbox[1], bbox[2] - 1, bbox[3] - 1
+    else:
         x_min = x_max = image.width//2
         y_min = y_max = image.height//2
     x_min -= padding
@@ -785,6 +805,94 @@ def save_eps(eps: str) -> Tuple[int, int]:
     return width, height
 
 
+def snapshot_canvas(records: Optional[ItemRecords] = None) -> Snapshot:
+    """Records the size and visible lines and polygons of the current turtle graphics canvas for draw_snapshot.
+    Items that can no longer change are kept in `records` so later snapshots only need to ask Tk about the rest.
+    """
+    turtle.update()
+    canvas = turtle.getcanvas()
+    width = max(canvas.winfo_width(), canvas.canvwidth)  # type: ignore
+    height = max(canvas.winfo_height(), canvas.canvheight)  # type: ignore
+    rgbs: Dict[str, OpColor] = {'': None}
+
+    def rgb(color: str) -> OpColor:
+        if color not in rgbs:
+            red, green, blue = canvas.winfo_rgb(color)
+            rgbs[color] = red // 257, green // 257, blue // 257
+        return rgbs[color]
+
+    if records is None:
+        records = {}
+    # What turtles have drawn is settled, except for the lines they are still extending and the fills they have yet to
+    # finish, which stay invisible until then. Turtle shapes and anything else are looked at every time.
+    turtles = turtle.turtles()
+    settled = set(chain.from_iterable(t.items for t in turtles))  # type: ignore
+    settled.difference_update(t.currentLineItem for t in turtles)  # type: ignore
+
+    items = []
+    for item in canvas.find_all():
+        if item in records:
+            record = records[item]
+        else:
+            kind, record = str(canvas.type(item)), None
+            if kind in ('line', 'polygon') and canvas.itemcget(item, 'state') != 'hidden':  # type: ignore
+                fill, outline = rgb(str(canvas.itemcget(item, 'fill'))), None  # type: ignore
+                if kind == 'polygon':
+                    outline = rgb(str(canvas.itemcget(item, 'outline')))  # type: ignore
+                if fill or outline:
+                    line_width = float(canvas.itemcget(item, 'width'))  # type: ignore
+                    record = kind, tuple(canvas.coords(item)), fill, outline, line_width
+            if kind not in ('line', 'polygon') or record and item in settled:
+                records[item] = record
+        if record:
+            items.append(record)
+    return (width, height), items
+
+
+def draw_snapshot(snapshot: Snapshot, png: str, output_scale: float, antialiasing: int) -> None:
+    """Draws canvas `snapshot` with Pillow to a transparent png like the one ghostscript would make from an eps.
+    For when ghostscript is unavailable. Only lines and polygons are drawn, not text or images.
+    """
+    (width, height), items = snapshot
+    scale = output_scale * antialiasing  # Pillow doesn't antialias so draw big and shrink instead.
+    image = Image.new('RGBA', (round(scale * width), round(scale * height)), (0, 0, 0, 0))
+    painter = ImageDraw.Draw(image)
+
+    def stroke(points: List[Tuple[float, float]], color: Color, line_width: float) -> None:
+        size = max(1, round(scale * line_width))
+        painter.line(points, color, size, 'curve')
+        for x, y in points[0], points[-1]:  # Round caps, which also make dots out of zero length lines.
+            painter.ellipse((x - size/2, y - size/2, x + size/2, y + size/2), color)
+
+    for kind, coords, fill, outline, line_width in items:
+        points = [(scale * (coords[i] + width//2), scale * (coords[i + 1] + height//2))
+                  for i in range(0, len(coords) - 1, 2)]
+        if not points:
+            continue
+        if kind == 'line':
+            stroke(points, cast(Color, fill), line_width)
+        else:
+            if fill and len(points) > 2:
+                painter.polygon(points, fill)
+            if outline:
+                stroke(points + points[:1], outline, line_width)
+
+    if antialiasing > 1:
+        box = getattr(Image, 'Resampling', Image).BOX  # Resampling enum is only in newer Pillow versions.
+        image = image.resize((round(output_scale * width), round(output_scale * height)), box)
+    image.save(png)
+
+
+def save_raster(
+        eps: str, output_scale: float, antialiasing: int, records: Optional[ItemRecords] = None) -> Tuple[int, int]:
+    """Draws current turtle graphics canvas with Pillow to the png ghostscript would have made from `eps`.
+    Stands in for save_eps when ghostscript is unavailable. `records` is passed on to snapshot_canvas.
+    """
+    snapshot = snapshot_canvas(records)
+    draw_snapshot(snapshot, str(Path(eps).with_suffix(PNG_EXT)), output_scale, antialiasing)
+    return snapshot[0]
+
+
 def pad_image(
     image: Image.Image,
     padding: Optional[int],
@@ -813,36 +921,71 @@ def save_png(
     transparent: bool,
     padding: Optional[int],
     rect: Optional[Tuple[int, int, int, int]] = None,
+    rasterized: bool = False,
 ) -> Tuple[str, Optional[Tuple[int, int, int, int]]]:
-    """Finalizes pre-existing eps file into png with background and padding."""
+    """Finalizes pre-existing eps file, or png from save_raster when `rasterized`, into png with background and padding.
+    """
     if not png:
         png = eps
     png = str(Path(png).with_suffix(PNG_EXT).resolve())
-    eps_to_png(eps, png, size, output_scale, antialiasing)
+    if not rasterized:
+        eps_to_png(eps, png, size, output_scale, antialiasing)
+    elif png != str(Path(eps).with_suffix(PNG_EXT).resolve()):
+        copyfile(Path(eps).with_suffix(PNG_EXT), png)
+    return png, finish_png(png, output_scale, background_color, transparent, padding, rect)
+
+
+def finish_png(
+    png: str,
+    output_scale: float,
+    background_color: Color,
+    transparent: bool,
+    padding: Optional[int],
+    rect: Optional[Tuple[int, int, int, int]] = None,
+) -> Optional[Tuple[int, int, int, int]]:
+    """Gives ghostscript's png output its background and padding in place. Returns the padding rect used."""
     image = Image.open(png).convert('RGBA')
     image, rect = pad_image(image, padding, rect, output_scale, background_color, transparent)
     image.save(png)
-    return png, rect
+    return rect
 
 
 def prep_gif(eps_paths: List[str], size: Tuple[int, int], background_color: Color, output_scale: float,
-             antialiasing: int, padding: Optional[int], transparent: bool) -> List[str]:
-    """Converts eps files into pngs in preperation for gif. Returns list of png paths."""
-    pngs, rect_for_all = [], None
-    for i, eps in enumerate(reversed(eps_paths)):  # Reverse so rect_for_all corresponds to last frame.
-        png, rect = save_png(None, eps, size, output_scale, antialiasing,
-                             background_color, transparent, padding, rect_for_all)
-        pngs.append(png)
+             antialiasing: int, padding: Optional[int], transparent: bool,
+             rasterized: bool = False) -> List[str]:
+    """Converts eps files into pngs in preperation for gif, or just finishes the pngs save_raster made if `rasterized`.
+    Returns list of png paths.
+    """
+    pngs = [os.path.splitext(eps)[0] + PNG_EXT for eps in eps_paths]  # Already absolute since drawdir is resolved.
+    message(f'Making {len(eps_paths)} gif frames...')  # Before ghostscript runs since it's the slowest part.
+    if not rasterized:
+        # Ghostscript is single-threaded, so split the frames into one batch per core, each a single gs process.
+        workers = os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            convert = partial(eps_to_pngs, size=size, output_scale=output_scale, antialiasing=antialiasing)
+            list(executor.map(convert, [eps_paths[i::workers] for i in range(workers)],
+                              [pngs[i::workers] for i in range(workers)]))
+    rect_for_all = None
+    for i, png in enumerate(reversed(pngs)):  # Reverse so rect_for_all corresponds to last frame.
+        rect = finish_png(png, output_scale, background_color, transparent, padding, rect_for_all)
         if not i:
             rect_for_all = rect
-            message(f'Making {len(eps_paths)} gif frames..', end='', flush=True)
+            message('Finishing gif frames..', end='', flush=True)
         elif (len(eps_paths) - i) % 10 == 0:
             message(f'{len(eps_paths) - i}..', end='', flush=True)
-    pngs.reverse()
     message('.')
     return pngs
 
 
+def load_frames(pngs: Iterable[str]) -> Iterator[Image.Image]:
+    """Yields the png files as rgba images, loading each only once per run of repeats."""
+    png, image = None, None
+    for next_png in pngs:
+        if next_png != png:
+            png, image = next_png, Image.open(next_png).convert('RGBA')
+        yield cast(Image.Image, image)
+
+
 def save_gif(
     gif: str,
     pngs: List[str],
@@ -855,15 +998,17 @@ def save_gif(
     alternate: bool,
 ) -> str:
     """Saves gif from pre-generated png files. Returns path to gif."""
-    images = [Image.open(png).convert('RGBA') for png in pngs]
     if reverse:
-        images.reverse()
-    if alternate:
-        images.extend(images[-2:0:-1])
+        pngs = pngs[::-1]
     gif = str(Path(gif).with_suffix(GIF_EXT).resolve())
-    frames = [images[0]] * (defer // duration) + images + [images[-1]] * (pause // duration)
-    frames[0].save(gif, save_all=True, append_images=frames[1:], loop=loops or 0, duration=duration,
-                   optimize=True, transparency=0 if transparent else 255)
+    last = pngs[1] if alternate and len(pngs) > 1 else pngs[-1]
+    back = islice(reversed(pngs), 1, len(pngs) - 1) if alternate else ()
+    order = chain(repeat(pngs[0], defer // duration), pngs, back, repeat(last, pause // duration))
+    # Lazy so there's no up front list of decoded rgba images. PIL still keeps a copy of every frame as it converts
+    # them, though at one byte per pixel rather than four.
+    frames = load_frames(order)
+    next(frames).save(gif, save_all=True, append_images=frames, loop=loops or 0, duration=duration,
+                      optimize=True, transparency=0 if transparent else 255)
     # PIL seems to treat blank animated gifs like static gifs, so their timing is wrong. But nbd since they're blank.
     return gif
 
@@ -890,6 +1035,7 @@ def run(
     frame_every: Union[int, Collection[str]],
     max_frames: Optional[int],
     drawdir: Optional[Path],
+    save_canvas: Callable[[str], Tuple[int, int]],
     callback: Optional[Callable[[str, turtle.Turtle], Optional[bool]]]
 ) -> Tuple[List[str], Tuple[int, int]]:
     """Run turtle `t` on L-system string `string` with given options."""
@@ -902,12 +1048,88 @@ def run(
     size = (1, 1)
     draws, frames_attempted = 0, 0
 
+    # When tracing is off nothing shows until the end anyway, so rather than moving the turtle one segment at a time,
+    # moves are tracked in Python and lines go straight to the canvas as long polylines. The turtle is only brought
+    # up to date when something needs it. Callbacks may inspect the turtle so they always get the slow path.
+    screen = t.getscreen()
+    canvas = screen.getcanvas()
+    batch = not callback and screen.tracer() == 0
+    x, y = t.position()
+    current_heading = t.heading()
+    logo = screen.mode() == 'logo'
+    synced, pen_down = True, t.isdown()
+    line: List[float] = []  # Canvas coordinates of the polyline being batched.
+    line_step: Optional[Tuple[float, bool]] = None  # Heading of the polyline's last segment and if it went backward.
+    line_color, line_width = '', -1.0  # Impossible values so the first set_pencolor and set_pensize always apply.
+    last_fill_color: OpColor = None
+    filling = False  # Mirrors t.filling() so moves needn't ask the turtle.
+    pendown, penup, forward = t.pendown, t.penup, t.forward  # Bound once rather than looked up on every move.
+
+    def flush_line() -> None:
+        nonlocal line_step
+        line_step = None
+        if len(line) > 2:
+            item = canvas.create_line(*line, fill=line_color, width=line_width, capstyle=tkinter.ROUND)
+            t.items.append(item)  # type: ignore # So t.clear() removes it like the turtle's own lines.
+        line.clear()
+
+    def sync() -> None:
+        nonlocal synced
+        flush_line()
+        if not synced:
+            orient(t, (x, y), current_heading)
+            if pen_down:
+                t.pendown()
+            else:
+                t.penup()
+            synced = True
+
+    def direction(of_heading: float) -> Tuple[float, float]:
+        radians = math.radians(of_heading * 360 / circle)
+        if logo:
+            return math.sin(radians), math.cos(radians)
+        return math.cos(radians), math.sin(radians)
+
+    directions: Dict[float, Tuple[float, float]] = {}  # Most L-systems turn between a handful of headings.
+
+    def advance(drawing: bool) -> None:
+        nonlocal x, y, line_step
+        if current_heading not in directions:
+            directions[current_heading] = direction(current_heading)
+        dx, dy = directions[current_heading]
+        if drawing and not line:
+            line.extend((x * screen.xscale, -y * screen.yscale))
+        x, y = x + length * dx, y + length * dy
+        if drawing:
+            step = current_heading, length < 0  # A negative length goes back along the same heading.
+            if line_step == step:
+                del line[-2:]  # Straight runs like FFFF only need their final point.
+            line.extend((x * screen.xscale, -y * screen.yscale))
+            line_step = step
+        else:
+            flush_line()
+
+    def jump(new_position: Optional[Tuple[float, float]], new_heading: Optional[float] = None) -> None:
+        nonlocal x, y, current_heading, synced
+        if batch:
+            flush_line()
+            if new_position:
+                x, y = new_position
+            if new_heading is not None:
+                current_heading = new_heading % circle
+            synced = False
+            if not filling:
+                return
+        orient(t, new_position, new_heading)
+
     def save_frame() -> None:
         nonlocal frames_attempted, size
         frames_attempted += 1
         if max_frames is None or len(eps_paths) < max_frames:
-            eps = str((cast(Path, drawdir) / f'{FRAME_NAME}{len(eps_paths)}').with_suffix(EPS_EXT))
-            size = save_eps(eps)
+            if batch:
+                sync()
+            eps = str(cast(Path, drawdir) / f'{FRAME_NAME}{len(eps_paths)}{EPS_EXT}')
+            size = save_canvas(eps)
             eps_paths.append(eps)
 
     def drew() -> None:
@@ -918,142 +1140,250 @@ def run(
                 save_frame()
 
     def set_pensize() -> None:
-        t.pensize(max(0, thickness))  # type: ignore
-
-    def set_color(color: Optional[Tuple[float, float, float]]) -> None:
+        nonlocal line_width
+        if line_width != max(0, thickness):
+            flush_line()
+            line_width = max(0, thickness)
+            t.pensize(line_width)  # type: ignore
+
+    def set_pencolor(color: Color) -> None:
+        nonlocal line_color
+        hex_color = rgb_to_hex(color)
+        if line_color != hex_color:  # Turtle color changes refresh the screen, so skip ones that do nothing.
+            flush_line()
+            line_color = hex_color
+            t.pencolor(color)
+
+    def set_fillcolor(color: Color) -> None:
+        nonlocal last_fill_color
+        if last_fill_color != color:
+            last_fill_color = color
+            t.fillcolor(color)
+
+    def set_color(color: Optional[Tuple[float, float, float]], conformed: OpColor = None) -> None:
         nonlocal pen_color, fill_color, modify_fill
         if modify_fill:
             modify_fill = False
             fill_color = color
             if fill_color:
-                t.fillcolor(cast(Color, conform_color(fill_color)))
+                set_fillcolor(conformed or cast(Color, conform_color(fill_color)))
         else:
             pen_color = color
             if pen_color:
-                t.pencolor(cast(Color, conform_color(pen_color)))
+                set_pencolor(conformed or cast(Color, conform_color(pen_color)))
 
     def increment_color(channel: int, decrement: bool = False) -> None:
         color = fill_color if modify_fill else pen_color
         if color:
-            amount = (-1 if decrement else 1) * color_increments[channel]
-            lst = list(color)
-            lst[channel] = clamp(lst[channel] + amount)
-            set_color((lst[0], lst[1], lst[2]))
+            amount = -color_increments[channel] if decrement else color_increments[channel]
+            red, green, blue = color
+            if channel == 0:
+                red = clamp(red + amount)
+            elif channel == 1:
+                green = clamp(green + amount)
+            else:
+                blue = clamp(blue + amount)
+            set_color((red, green, blue))
+
+    # Length:
+    def move(drawing: bool) -> None:
+        nonlocal synced, pen_down
+        if batch:
+            if not filling:
+                advance(drawing)
+                synced, pen_down = False, drawing
+                return
+            advance(False)  # Fills need the turtle to trace their outline itself.
+            pen_down = drawing
+        if drawing:
+            pendown()
+        else:
+            penup()
+        forward(length)
+
+    def move_drawing() -> None:
+        move(bool(pen_color and line_width))
+        drew()
+
+    def move_not_drawing() -> None:
+        move(False)
+
+    def reset_length() -> None:
+        nonlocal length
+        length = initial_length
+
+    def increment_length(amount: float) -> None:
+        nonlocal length
+        length += amount
+
+    def multiply_length() -> None:
+        nonlocal length
+        length *= length_scalar
+
+    def divide_length() -> None:
+        nonlocal length
+        length /= length_scalar
+
+    # Angle:
+    def set_heading(new_heading: float) -> None:
+        nonlocal current_heading, synced
+        if batch:
+            current_heading = new_heading % circle  # Kept within a circle so headings repeat for the directions cache.
+            if not filling:
+                synced = False
+                return
+        t.seth(new_heading)
+
+    def turn(sign: int) -> None:
+        set_heading((current_heading if batch else t.heading()) + sign * (-1 if swap_signs else 1) * angle)
+
+    def toggle_swap_signs() -> None:
+        nonlocal swap_signs
+        swap_signs = not swap_signs
+
+    def half_turn() -> None:
+        if batch:
+            set_heading(current_heading + (1 if logo else -1) * circle/2.0)
+        else:
+            t.right(circle/2.0)
+
+    def reset_angle() -> None:
+        nonlocal angle
+        angle = initial_angle
+
+    def increment_angle(amount: float) -> None:
+        nonlocal angle
+        angle += amount
+
+    # Thickness:
+    def reset_thickness() -> None:
+        nonlocal thickness
+        thickness = initial_thickness
+        set_pensize()
+
+    def increment_thickness(amount: float) -> None:
+        nonlocal thickness
+        thickness = max(0, thickness + amount)
+        set_pensize()
+
+    # Color:
+    def set_modify_fill() -> None:
+        nonlocal modify_fill
+        modify_fill = True
+
+    # Other:
+    def begin_fill() -> None:
+        nonlocal filling
+        if fill_color:
+            if batch:
+                sync()
+            t.begin_fill()
+            filling = True
+
+    def end_fill() -> None:
+        nonlocal filling
+        if fill_color:
+            t.end_fill()
+            filling = False
+        drew()
+
+    def dot() -> None:
+        if fill_color:
+            if batch:
+                sync()
+            t.dot(None, fill_color)
+        drew()
+
+    def toggle_swap_cases() -> None:
+        nonlocal swap_cases
+        swap_cases = not swap_cases
+
+    def push() -> None:
+        position, heading = ((x, y), current_heading) if batch else ((t.xcor(), t.ycor()), t.heading())
+        stack.append((position, heading, angle, length, thickness,
+                      pen_color, fill_color, swap_signs, swap_cases, modify_fill))
+
+    def pop() -> None:
+        nonlocal angle, length, swap_signs, swap_cases, modify_fill, pen_color, fill_color
+        if stack:
+            (position, heading, angle, length, _,
+             pen_color, fill_color, swap_signs, swap_cases, modify_fill) = stack.pop()
+            jump(position, heading)
+
+    # Dispatch table from L-system characters to their instructions, so each character costs a single lookup.
+    instructions: Dict[str, Callable[[], None]] = {
+        '_': reset_length,
+        '^': partial(increment_length, length_increment),
+        '%': partial(increment_length, -length_increment),
+        '*': multiply_length,
+        '/': divide_length,
+        '+': partial(turn, 1),
+        '-': partial(turn, -1),
+        '&': toggle_swap_signs,
+        '|': half_turn,
+        '~': reset_angle,
+        ')': partial(increment_angle, angle_increment),
+        '(': partial(increment_angle, -angle_increment),
+        '=': reset_thickness,
+        '>': partial(increment_thickness, thickness_increment),
+        '<': partial(increment_thickness, -thickness_increment),
+        '#': set_modify_fill,
+        ',': partial(increment_color, 0),
+        '.': partial(increment_color, 0, True),
+        ';': partial(increment_color, 1),
+        ':': partial(increment_color, 1, True),
+        '?': partial(increment_color, 2),
+        '!': partial(increment_color, 2, True),
+        '{': begin_fill,
+        '}': end_fill,
+        '@': dot,
+        '`': toggle_swap_cases,
+        '"': partial(jump, position),
+        "'": partial(jump, None, heading),
+        '$': stack.clear,
+        '[': push,
+        ']': pop,
+    }
+    instructions.update(dict.fromkeys(ascii_uppercase, move_drawing))
+    instructions.update(dict.fromkeys(ascii_lowercase, move_not_drawing))
+    # The colors are already conformed so digits can pass them on as is.
+    instructions.update((digit, partial(set_color, colors[i], colors[i])) for i, digit in enumerate(digits))
 
     set_pensize()
     if pen_color:
-        t.pencolor(cast(Color, conform_color(pen_color)))
+        set_pencolor(cast(Color, conform_color(pen_color)))
     if fill_color:
-        t.fillcolor(cast(Color, conform_color(fill_color)))
+        set_fillcolor(cast(Color, conform_color(fill_color)))
     if gif:
         save_frame()
 
-    for i, c in enumerate(string):
-        if max_chars is not None and i >= max_chars or max_draws is not None and draws >= max_draws:
-            break
-        if swap_cases and c.isalpha():
-            c = c.lower() if c.isupper() else c.upper()
+    # Settle what doesn't change per character before the loop so each character does as little as possible.
+    instruction_for = instructions.get
+    frame_chars: Collection[str] = () if isinstance(frame_every, int) else frame_every
+    chars = string if max_chars is None else string[:max(0, max_chars)]
+    if max_draws is None and not callback and not frame_chars and '`' not in chars:
+        # The common case where nothing needs to see individual characters, so just run their instructions.
+        for step in filter(None, map(instruction_for, chars.partition('\\')[0])):
+            step()
+    else:
+        for c in chars:
+            if max_draws is not None and draws >= max_draws:
+                break
+            if swap_cases:
+                c = SWAPPED_CASES.get(c, c)
 
-        # Length:
-        if 'A' <= c <= 'Z':
-            if pen_color and t.pensize():
-                t.pendown()
-            else:
-                t.penup()
-            t.forward(length)
-            drew()
-        elif 'a' <= c <= 'z':
-            t.penup()
-            t.forward(length)
-        elif c == '_':
-            length = initial_length
-        elif c == '^':
-            length += length_increment
-        elif c == '%':
-            length -= length_increment
-        elif c == '*':
-            length *= length_scalar
-        elif c == '/':
-            length /= length_scalar
-        # Angle:
-        elif c == '+':
-            t.seth(t.heading() + (-1 if swap_signs else 1) * angle)
-        elif c == '-':
-            t.seth(t.heading() - (-1 if swap_signs else 1) * angle)
-        elif c == '&':
-            swap_signs = not swap_signs
-        elif c == '|':
-            t.right(circle/2.0)
-        elif c == '~':
-            angle = initial_angle
-        elif c == ')':
-            angle += angle_increment
-        elif c == '(':
-            angle -= angle_increment
-        # Thickness:
-        elif c == '=':
-            thickness = initial_thickness
-            set_pensize()
-        elif c == '>':
-            thickness = max(0, thickness + thickness_increment)
-            set_pensize()
-        elif c == '<':
-            thickness = max(0, thickness - thickness_increment)
-            set_pensize()
-        # Color:
-        elif '0' <= c <= '9':
-            set_color(colors[int(c)])
-        elif c == '#':
-            modify_fill = True
-        elif c == ',':
-            increment_color(0)
-        elif c == '.':
-            increment_color(0, True)
-        elif c == ';':
-            increment_color(1)
-        elif c == ':':
-            increment_color(1, True)
-        elif c == '?':
-            increment_color(2)
-        elif c == '!':
-            increment_color(2, True)
-        # Other:
-        elif c == '{':
-            if fill_color:
-                t.begin_fill()
-        elif c == '}':
-            if fill_color:
-                t.end_fill()
-            drew()
-        elif c == '@':
-            if fill_color:
-                t.dot(None, fill_color)
-            drew()
-        elif c == '`':
-            swap_cases = not swap_cases
-        elif c == '"':
-            orient(t, position)
-        elif c == "'":
-            orient(t, None, heading)
-        elif c == '$':
-            stack.clear()
-        elif c == '[':
-            stack.append(State((t.xcor(), t.ycor()), t.heading(), angle, length, thickness,
-                               pen_color, fill_color, swap_signs, swap_cases, modify_fill))
-        elif c == ']':
-            if stack:
-                state = stack.pop()
-                orient(t, state.position, state.heading)
-                angle, length = state.angle, state.length
-                swap_signs, swap_cases, modify_fill = state.swap_signs, state.swap_cases, state.modify_fill
-                pen_color, fill_color = state.pen_color, state.fill_color
-
-        if not isinstance(frame_every, int) and c in frame_every:
-            save_frame()
-
-        if callback and callback(c, t) or c == '\\':
-            break
+            instruction = instruction_for(c)
+            if instruction:
+                instruction()
+
+            if frame_chars and c in frame_chars:
+                save_frame()
+
+            if callback and callback(c, t) or c == '\\':
+                break
 
+    if batch:
+        sync()
     if gif:
         if isinstance(frame_every, int) and draws % frame_every != 0:
             save_frame()  # Save frame of final changes unless nothing has changed.
@@ -2,9 +2,26 @@
 
 import string
 import random
+from turtle import Turtle
+from typing import Any, List
 from TurtLSystems import draw
 
 
+def drawn_xs(t: Turtle) -> List[float]:
+    """Returns the x canvas coordinates of every line drawn by turtle `t`."""
+    canvas = t.getscreen().getcanvas()
+    return [x for item in t.items if canvas.type(item) == 'line' for x in canvas.coords(item)[::2]]  # type: ignore
+
+
+def assert_same_as_asap(start: str, **kwargs: Any) -> None:
+    """Asserts that drawing `start` with asap=True leaves the turtle as drawing it without asap does."""
+    slow, fast = draw(start, '', **kwargs)[1], draw(start, '', asap=True, **kwargs)[1]
+    assert round(fast.xcor(), 6) == round(slow.xcor(), 6)
+    assert round(fast.ycor(), 6) == round(slow.ycor(), 6)
+    assert round(fast.heading(), 6) % 360 == round(slow.heading(), 6) % 360
+    assert fast.isdown() == slow.isdown()
+
+
 def test_letters() -> None:
     """Testing A-Z and a-z."""
     for c in string.ascii_letters:
@@ -38,6 +55,24 @@ def test_plusminus() -> None:
     assert draw('f+-f', '', angle=45, length=10)[1].pos() == (20, 0)
 
 
+def test_length_sign_change() -> None:
+    """Testing lines that double back when * or % flip the sign of the length."""
+    for asap in (False, True):
+        assert max(drawn_xs(draw('F*F', '', length=10, length_scalar=-1, asap=asap)[1])) == 10
+        assert max(drawn_xs(draw('FFFF%%%%%F', '', length=10, asap=asap)[1])) == 40
+
+
+def test_asap() -> None:
+    """Testing that asap draws, which skip moving the turtle where they can, end up the same as regular draws."""
+    for start in ('FfGg', 'FFff', 'F+F-f|F', 'F++++F', 'F&+F-F', 'F)+F(-F~+F', '`Ff`Ff', 'F*F/F^F%F_F',
+                  'F[+F[-F]F]F', 'F[+F$]F]F', 'F+F"F\'F', '{F+F+F}F', 'F{F[+F]-F}@F', 'F{F"F}F@f', '{F"f}@',
+                  'F>F<<F=F'):
+        assert_same_as_asap(start, angle=30, length=10)
+    assert_same_as_asap('F*F+F%%%%%F', angle=45, length=10, length_scalar=-1.5)
+    assert_same_as_asap('F+F-F', angle=90, length=10, scale=-2, heading=30, position=(5, 5))
+    assert_same_as_asap('F+F\\F', angle=90, length=10)
+
+
 # TODO test the rest
 
 
@@ -0,0 +1,38 @@
+"""File to test L-system expansion."""
+
+from TurtLSystems import lsystem
+
+
+def test_string_rules() -> None:
+    """Testing rules given as a string."""
+    assert lsystem('A', 'A AB B A', 1) == 'AB'
+    assert lsystem('A', 'A AB B A', 5) == 'ABAABABAABAAB'
+    assert lsystem('F+G+G', 'F F+G-F-G+F G GG', 1) == 'F+G-F-G+F+GG+GG'
+    assert lsystem('X', 'X F[+X]-X F FF', 2) == 'FF[+F[+X]-X]-F[+X]-X'
+
+
+def test_dict_rules() -> None:
+    """Testing rules given as a dict."""
+    assert lsystem('A', {'A': 'AB', 'B': 'A'}, 5) == lsystem('A', 'A AB B A', 5)
+    assert lsystem('F', {'F': 'F+F--F+F'}, 2) == 'F+F--F+F+F+F--F+F--F+F--F+F+F+F--F+F'
+    assert lsystem('AB', {}, 3) == 'AB'
+
+
+def test_unmatched_characters() -> None:
+    """Testing characters without rules and rules with multi-character keys, which never match."""
+    assert lsystem('A-C', 'A AA', 2) == 'AAAA-C'
+    assert lsystem('AB', 'AB X', 1) == 'AB'
+    assert lsystem('AB', {'AB': 'X', 'B': 'Y'}, 2) == 'AY'
+
+
+def test_unreachable_rules() -> None:
+    """Testing that rules for symbols `start` never reaches are not expanded, even when they grow quickly."""
+    assert lsystem('F', {'F': 'F+F', 'X': 'XXXXXXXX'}, 12) == lsystem('F', 'F F+F', 12)  # X would be 8**12 long.
+    assert lsystem('A', 'A B B C C CCCCCCCC', 2) == 'C'
+
+
+def test_levels() -> None:
+    """Testing level 0 and negative levels, which leave `start` as is."""
+    assert lsystem('F+F', 'F FF', 0) == 'F+F'
+    assert lsystem('F+F', 'F FF', -3) == 'F+F'
+    assert lsystem('', 'F FF', 4) == ''